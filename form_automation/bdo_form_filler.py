@@ -3,27 +3,38 @@ BDO Form Automation Script with enhanced element detection and interaction
 """
 
 import os
+import json
+import asyncio
 import time
-import random
 import logging
-import subprocess
+import signal
+import queue
 import threading
+import subprocess
+from concurrent.futures import (
+    ThreadPoolExecutor, ProcessPoolExecutor, Future, FIRST_COMPLETED,
+    wait as wait_futures, TimeoutError as FutureTimeoutError
+)
+from collections import deque
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from itertools import islice
+from multiprocessing.util import Finalize
 from dataclasses import dataclass
-from typing import Optional, List, Dict, Any, Union, Tuple
-from urllib.parse import urlparse
+from html.parser import HTMLParser
+from typing import Optional, List, Dict, Any, Tuple, Iterable, Iterator, Callable
 
+import httpx
 import pandas as pd
+from openpyxl import Workbook, load_workbook
 from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.wait import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support.select import Select
 from selenium.common.exceptions import (
-    TimeoutException, NoSuchElementException, ElementNotInteractableException,
-    StaleElementReferenceException
+    TimeoutException, NoSuchElementException,
+    StaleElementReferenceException, JavascriptException, WebDriverException
 )
 from selenium.webdriver import ActionChains
 from selenium.webdriver.common.keys import Keys
@@ -31,17 +42,156 @@ from selenium.webdriver.common.keys import Keys
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def kill_chrome() -> None:
-    """Kill Chrome processes"""
+FORM_URL = "https://www.apply.bdo.com.ph/newntb/"
+
+# Shared deadline and polling interval for element lookups (seconds)
+ELEMENT_TIMEOUT = 20
+POLL_INTERVAL = 0.05
+
+# Dial code selected for every number
+DIAL_CODE = "+92"
+
+# Form values in the order they are filled, keyed as in build_form_data()
+FORM_FIELDS = ('countryCode', 'firstName', 'lastName', 'phone', 'email')
+
+# Fills the form and clicks Next; returns 'clicked' or the reason it stopped before the click.
+# The popup is awaited by a separate call, since the Next postback may replace this page
+FILL_AND_SUBMIT_JS = """
+    data => {
+        const ids = window.__formIds;
+        try {
+            const fillField = (id, value) => {
+                const el = document.getElementById(id);
+                if (!el) return false;
+                el.value = value;
+                el.dispatchEvent(new Event('change', {bubbles: true}));
+                el.dispatchEvent(new Event('input', {bubbles: true}));
+                return true;
+            };
+
+            // Country code first, then the other fields
+            for (const key of ids.fields) {
+                if (!fillField(ids[key], data[key])) return ids[key] + ' not found';
+            }
+
+            // Click the next button by exact name, then ID, then value
+            const nextBtn = document.getElementsByName(ids.nextName)[0]
+                || document.getElementById(ids.next)
+                || document.querySelector('input[type="button"][value="Next"]');
+            if (!nextBtn) return 'next button not found';
+            nextBtn.click();
+            return 'clicked';
+        } catch (e) {
+            console.error(e);
+            return String(e);
+        }
+    }
+"""
+
+# Clears the fields of an already loaded form, then fills and submits it again
+RESET_AND_FILL_JS = """
+    data => {
+        const ids = window.__formIds;
+        for (const key of ids.fields.filter(key => key !== 'countryCode')) {
+            const el = document.getElementById(ids[key]);
+            if (!el) return ids[key] + ' not found';
+            el.value = '';
+            el.dispatchEvent(new Event('change', {bubbles: true}));
+            el.dispatchEvent(new Event('input', {bubbles: true}));
+        }
+        return window.__fillForm(data);
+    }
+"""
+
+# Clicks the confirmation popup's OK button once it is shown; returns whether it was clicked
+CLICK_POPUP_JS = """
+const okBtn = document.getElementById(arguments[0]);
+if (!okBtn || okBtn.offsetParent === null) return false;
+okBtn.click();
+return true;
+"""
+
+# Image requests blocked in every browser; stylesheets stay because visibility checks depend on them
+BLOCKED_URLS = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico"]
+
+# Numbers submitted on one page load before it is reloaded from scratch
+MAX_PAGE_REUSES = 10
+
+# Direct HTTP submission: concurrent requests, per-request timeout (seconds) and rows per round
+HTTP_CONCURRENCY = 20
+HTTP_TIMEOUT = 30
+HTTP_CHUNK_SIZE = 100
+
+# Response markers that mean the site wants a real browser
+BOT_CHECK_MARKERS = ('captcha', 'are you a robot', 'access denied')
+
+# Text that only appears in the response to an accepted postback; the fast path needs it set
+HTTP_SUCCESS_MARKER = os.getenv('BDO_HTTP_SUCCESS_MARKER')
+
+# URL fragments of ASP.NET error pages a failed postback can redirect to
+ERROR_PATH_MARKERS = ('error', 'aspxerrorpath')
+
+def chrome_service() -> Service:
+    """Create the chromedriver service, in its own session on POSIX so kill_chrome can reach Chrome"""
+    if os.name == 'nt':
+        return Service()
+    return Service(popen_kw={'start_new_session': True})
+
+def chrome_options(use_profile: bool = False) -> webdriver.ChromeOptions:
+    """Build the Chrome options shared by every browser this script starts.
+    Batch workers run headless; the user's profile opens as a visible window"""
+    options = webdriver.ChromeOptions()
+    if not use_profile:
+        options.add_argument('--headless=new')
+    options.add_argument('--window-size=1920,1080')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_argument('--disable-extensions')
+    options.add_argument('--disable-notifications')
+    options.add_argument('--disable-popup-blocking')
+    
+    if use_profile:
+        # Use default profile to maintain login state
+        options.add_argument(f"--user-data-dir=C:\\Users\\{os.getenv('USERNAME')}\\AppData\\Local\\Google\\Chrome\\User Data")
+        options.add_argument("--profile-directory=Default")
+    
+    # Disable automation flags
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    return options
+
+def kill_chrome(pid: int) -> None:
+    """Kill a chromedriver process and the browser it started, without waiting"""
     try:
-        subprocess.run(['taskkill', '/F', '/IM', 'chrome.exe'], 
-                      stdout=subprocess.DEVNULL, 
-                      stderr=subprocess.DEVNULL,
-                      check=False)
-        time.sleep(2)
+        if os.name == 'nt':
+            subprocess.Popen(['taskkill', '/F', '/T', '/PID', str(pid)],
+                             stdout=subprocess.DEVNULL,
+                             stderr=subprocess.DEVNULL)
+        else:
+            # chrome_service() made chromedriver a process group leader, and Chrome inherits the group
+            os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
     except Exception as e:
         logging.error(f"Error killing Chrome: {e}")
 
+def quit_driver(driver: webdriver.Chrome, timeout: float = 5) -> None:
+    """Quit a driver, killing its processes only if quit() hangs"""
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        executor.submit(driver.quit).result(timeout=timeout)
+    except FutureTimeoutError:
+        logging.warning("driver.quit() timed out, killing browser processes")
+        process = getattr(driver.service, 'process', None)
+        if process:
+            kill_chrome(process.pid)
+    except Exception as e:
+        logging.warning(f"Error quitting driver: {e}")
+    finally:
+        executor.shutdown(wait=False)
+
 @dataclass
 class ElementLocator:
     """Class to represent a single element locator with multiple strategies"""
@@ -50,130 +200,162 @@ class ElementLocator:
     
     def __post_init__(self):
         # Ensure strategies are valid
-        valid_by = [By.ID, By.NAME, By.CLASS_NAME, By.CSS_SELECTOR, By.XPATH]
+        # XPath is deliberately excluded: it is the slowest strategy
+        valid_by = [By.ID, By.NAME, By.CLASS_NAME, By.CSS_SELECTOR]
         for by, _ in self.strategies:
             if by not in valid_by:
                 raise ValueError(f"Invalid locator strategy: {by}")
 
+def locator_css(by: str, value: str) -> str:
+    """Translate a Selenium locator into an equivalent CSS selector"""
+    quoted = json.dumps(value)
+    if by == By.ID:
+        return f"[id={quoted}]"
+    if by == By.NAME:
+        return f"[name={quoted}]"
+    if by == By.CLASS_NAME:
+        return f"[class~={quoted}]"
+    if by == By.CSS_SELECTOR:
+        return value
+    raise ValueError(f"Invalid locator strategy: {by}")
+
 class FormLocators:
     """Class to store form element locators with multiple strategies"""
+    # Raw element IDs, shared by the locators below, the injected JS and the HTTP postback
+    FIRST_NAME_ID = "firstname"
+    LAST_NAME_ID = "lastname"
+    MOBILE_NUMBER_ID = "posttext"
+    EMAIL_ID = "emailaddress1"
+    COUNTRY_CODE_ID = "codrp"
+    NEXT_BUTTON_ID = "NextButton"
+    NEXT_BUTTON_NAME = "ctl00$ContentContainer$WebFormControl_50052ed5c76aeb11a812002248167989$NextButton"
+    OK_BUTTON_ID = "personalbtn"
+    
+    # Element ID for each key of build_form_data()
+    FIELD_IDS = {
+        'countryCode': COUNTRY_CODE_ID,
+        'firstName': FIRST_NAME_ID,
+        'lastName': LAST_NAME_ID,
+        'phone': MOBILE_NUMBER_ID,
+        'email': EMAIL_ID
+    }
+    
     FIRST_NAME = ElementLocator("First Name", [
-        (By.NAME, "firstName"),
-        (By.ID, "firstName"),
-        (By.CSS_SELECTOR, "input[name='firstName']"),
-        (By.XPATH, "//input[@placeholder='First Name']")
+        (By.ID, FIRST_NAME_ID),
+        (By.CSS_SELECTOR, f"#{FIRST_NAME_ID}")
     ])
     
     LAST_NAME = ElementLocator("Last Name", [
-        (By.NAME, "lastName"),
-        (By.ID, "lastName"),
-        (By.CSS_SELECTOR, "input[name='lastName']"),
-        (By.XPATH, "//input[@placeholder='Last Name']")
+        (By.ID, LAST_NAME_ID),
+        (By.CSS_SELECTOR, f"#{LAST_NAME_ID}")
     ])
     
     MOBILE_NUMBER = ElementLocator("Mobile Number", [
-        (By.NAME, "mobileNumber"),
-        (By.ID, "mobileNumber"),
-        (By.CSS_SELECTOR, "input[name='mobileNumber']"),
-        (By.XPATH, "//input[contains(@placeholder, 'Mobile')]")
+        (By.ID, MOBILE_NUMBER_ID),
+        (By.CSS_SELECTOR, f"#{MOBILE_NUMBER_ID}")
     ])
     
     EMAIL = ElementLocator("Email", [
-        (By.NAME, "email"),
-        (By.ID, "email"),
-        (By.CSS_SELECTOR, "input[type='email']"),
-        (By.XPATH, "//input[@type='email']")
+        (By.ID, EMAIL_ID),
+        (By.CSS_SELECTOR, f"#{EMAIL_ID}")
     ])
     
     COUNTRY_CODE = ElementLocator("Country Code", [
-        (By.ID, "codrp"),
-        (By.NAME, "countryCode"),
-        (By.CSS_SELECTOR, "select#codrp"),
-        (By.XPATH, "//select[contains(@id, 'codrp')]")
+        (By.ID, COUNTRY_CODE_ID),
+        (By.CSS_SELECTOR, f"select#{COUNTRY_CODE_ID}")
     ])
     
     NEXT_BUTTON = ElementLocator("Next Button", [
-        (By.CSS_SELECTOR, "button.btn.btn-primary.button.next.submit-btn"),
-        (By.XPATH, "//button[contains(@class, 'next')]"),
-        (By.XPATH, "//button[contains(text(), 'Next')]"),
-        (By.CSS_SELECTOR, ".btn-primary.next")
+        (By.ID, NEXT_BUTTON_ID),
+        (By.CSS_SELECTOR, "input[type='button'][value='Next']")
     ])
     
     OK_BUTTON = ElementLocator("OK Button", [
-        (By.XPATH, "//button[contains(text(), 'OK')]"),
-        (By.XPATH, "//button[contains(text(), 'Ok')]"),
-        (By.CSS_SELECTOR, "button.ok-button"),
-        (By.CSS_SELECTOR, ".modal-footer button")
+        (By.ID, OK_BUTTON_ID),
+        (By.CSS_SELECTOR, f"#{OK_BUTTON_ID}")
     ])
 
+# Element IDs handed to the injected JS as window.__formIds
+FORM_IDS = dict(
+    FormLocators.FIELD_IDS,
+    fields=list(FORM_FIELDS),
+    next=FormLocators.NEXT_BUTTON_ID,
+    nextName=FormLocators.NEXT_BUTTON_NAME,
+    ok=FormLocators.OK_BUTTON_ID
+)
+
+# Installed into every new document so each page load already has the functions compiled
+FILL_FN_SRC = (f"window.__formIds = {json.dumps(FORM_IDS)};"
+               f"window.__fillForm = {FILL_AND_SUBMIT_JS};"
+               f"window.__resetAndFill = {RESET_AND_FILL_JS};")
+
+def build_form_data(row: Dict[str, str]) -> Dict[str, str]:
+    """Map a prepared row onto the form's values"""
+    return {
+        'countryCode': DIAL_CODE,
+        'firstName': row['first'],
+        'lastName': row['first'],
+        'phone': row['phone11'],
+        'email': row['email']
+    }
+
 class BDOFormFiller:
     """Enhanced BDO form automation with robust element handling"""
     
     def __init__(self) -> None:
         """Initialize the form filler with proper type handling"""
-        self.url = "https://www.apply.bdo.com.ph/newntb/"
+        self.url = FORM_URL
         self.driver: Optional[webdriver.Chrome] = None
         self.wait: Optional[WebDriverWait] = None
         self.locators = FormLocators()
+        self._elem_cache: Dict[str, WebElement] = {}
+        self._page_uses = 0
+        self._root_node = 0
         
         try:
-            options = webdriver.ChromeOptions()
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-gpu')
-            options.add_argument('--disable-blink-features=AutomationControlled')
-            options.add_argument('--disable-extensions')
-            options.add_argument('--disable-notifications')
-            options.add_argument('--disable-popup-blocking')
-            options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            options.add_experimental_option('useAutomationExtension', False)
-            
-            service = Service()
-            self.driver = webdriver.Chrome(service=service, options=options)
+            service = chrome_service()
+            self.driver = webdriver.Chrome(service=service, options=chrome_options())
             self.wait = WebDriverWait(self.driver, 20)  # Increased timeout
-            self.driver.maximize_window()
+            self.enable_cdp()
             
         except Exception as e:
             logging.error(f"Error initializing driver: {e}")
             if self.driver:
-                self.driver.quit()
+                quit_driver(self.driver)
             raise
 
-    def setup_logging(self) -> None:
-        """Configure detailed logging"""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('bdo_form_automation.log'),
-                logging.StreamHandler()
-            ]
-        )
+    def enable_cdp(self) -> None:
+        """Enable the DevTools domains used for direct page interaction"""
+        if not isinstance(self.driver, webdriver.Chrome):
+            return
+        self.driver.execute_cdp_cmd("Page.enable", {})
+        self.driver.execute_cdp_cmd("Runtime.enable", {})
+        self.driver.execute_cdp_cmd("DOM.enable", {})
+        
+        # Images are never needed to fill the form
+        self.driver.execute_cdp_cmd("Network.enable", {})
+        self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+        self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": FILL_FN_SRC})
+
+    def evaluate(self, expression: str) -> Any:
+        """Evaluate JavaScript in the page via CDP and return its value"""
+        if not isinstance(self.driver, webdriver.Chrome):
+            raise JavascriptException("WebDriver not properly initialized")
+            
+        response = self.driver.execute_cdp_cmd("Runtime.evaluate", {
+            "expression": expression,
+            "awaitPromise": True,
+            "returnByValue": True
+        })
+        if 'exceptionDetails' in response:
+            raise JavascriptException(response['exceptionDetails'].get('text', 'Script error'))
+        return response.get('result', {}).get('value')
 
     def setup_driver(self) -> bool:
         """Set up Chrome WebDriver with proper initialization"""
         try:
-            # Kill any existing Chrome processes first
-            kill_chrome()
-            time.sleep(2)
-            
-            options = webdriver.ChromeOptions()
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-gpu')
-            options.add_argument('--disable-blink-features=AutomationControlled')
-            options.add_argument('--start-maximized')
-            
-            # Use default profile to maintain login state
-            options.add_argument(f"--user-data-dir=C:\\Users\\{os.getenv('USERNAME')}\\AppData\\Local\\Google\\Chrome\\User Data")
-            options.add_argument("--profile-directory=Default")
-            
-            # Disable automation flags
-            options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            options.add_experimental_option('useAutomationExtension', False)
-            
-            service = Service()
-            driver = webdriver.Chrome(service=service, options=options)
+            service = chrome_service()
+            driver = webdriver.Chrome(service=service, options=chrome_options(use_profile=True))
             
             if not isinstance(driver, webdriver.Chrome):
                 logging.error("Failed to initialize Chrome WebDriver")
@@ -181,66 +363,118 @@ class BDOFormFiller:
                 
             self.driver = driver
             self.wait = WebDriverWait(self.driver, 20)
+            self.enable_cdp()
             
             # Navigate to URL
-            self.driver.get(self.url)
-            time.sleep(2)
+            self.navigate()
             
             return True
             
         except Exception as e:
             logging.error(f"Error setting up WebDriver: {e}")
             if self.driver:
-                try:
-                    self.driver.quit()
-                except:
-                    pass
+                quit_driver(self.driver)
             return False
             
+    def navigate(self, url: Optional[str] = None) -> None:
+        """Load a page and drop element references from the previous one"""
+        if not isinstance(self.driver, webdriver.Chrome):
+            return
+        self._elem_cache.clear()
+        self._page_uses = 0
+        self._root_node = 0
+        self.driver.get(url or self.url)
+        WebDriverWait(self.driver, 10).until(
+            lambda d: d.execute_script("return document.readyState") == "complete"
+        )
+
+    def get_cached_element(self, locator: ElementLocator) -> Optional[WebElement]:
+        """Return a cached element if it is still attached to the page"""
+        element = self._elem_cache.get(locator.name)
+        if element is None:
+            return None
+        try:
+            element.is_enabled()
+            return element
+        except StaleElementReferenceException:
+            self._elem_cache.pop(locator.name, None)
+            return None
+
+    def document_node(self) -> int:
+        """Return the CDP document node id, fetched once per document"""
+        assert self.driver is not None
+        if not self._root_node:
+            self._root_node = self.driver.execute_cdp_cmd("DOM.getDocument", {"depth": 0})["root"]["nodeId"]
+        return self._root_node
+
+    def query_node(self, selector: str) -> int:
+        """Look up a selector with CDP DOM.querySelector, returning 0 when absent"""
+        assert self.driver is not None
+        try:
+            return self.driver.execute_cdp_cmd("DOM.querySelector", {
+                "nodeId": self.document_node(),
+                "selector": selector
+            }).get("nodeId", 0)
+        except WebDriverException:
+            # DOM.documentUpdated invalidates every node id; execute_cdp_cmd cannot deliver
+            # that event, so the stale-id error is the signal to fetch the new document once
+            self._root_node = 0
+            return self.driver.execute_cdp_cmd("DOM.querySelector", {
+                "nodeId": self.document_node(),
+                "selector": selector
+            }).get("nodeId", 0)
+
     def wait_for_element(self, locator: ElementLocator) -> Optional[WebElement]:
-        """Wait for element with proper type checking"""
+        """Wait for element by querying the DOM directly over CDP"""
         if not isinstance(self.driver, webdriver.Chrome) or not self.wait:
             return None
             
+        cached = self.get_cached_element(locator)
+        if cached is not None:
+            return cached
+            
+        # Strategies are tried in their listed order, so By.ID keeps priority over fallbacks
+        strategies = [(by, value, locator_css(by, value)) for by, value in locator.strategies]
+        
         try:
-            for strategy in locator.strategies:
-                try:
-                    element = self.wait.until(
-                        EC.presence_of_element_located((strategy[0], strategy[1]))
-                    )
-                    if element and element.is_displayed():
-                        return element
-                except:
-                    continue
+            deadline = time.monotonic() + ELEMENT_TIMEOUT
+            while time.monotonic() < deadline:
+                for by, value, selector in strategies:
+                    try:
+                        if not self.query_node(selector):
+                            continue
+                        # Fetch the element with the strategy that matched, not a merged selector
+                        element = self.driver.find_element(by, value)
+                        if element.is_displayed():
+                            self._elem_cache[locator.name] = element
+                            return element
+                    except (WebDriverException, NoSuchElementException, StaleElementReferenceException):
+                        continue
+                time.sleep(POLL_INTERVAL)
             return None
         except Exception as e:
             logging.error(f"Error finding element {locator.name}: {e}")
             return None
             
-    def ensure_element_interactable(self, element: WebElement) -> bool:
+    def ensure_element_interactable(self, element: WebElement, hover: bool = False) -> bool:
         """Ensure element is truly interactable with proper driver checks"""
         if not isinstance(self.driver, webdriver.Chrome):
             logging.error("WebDriver not properly initialized")
             return False
             
         try:
-            # Scroll element into center view
+            # Scroll element into center view instantly
             self.driver.execute_script(
-                "arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});",
+                "arguments[0].scrollIntoView({block: 'center'});",
                 element
             )
-            time.sleep(1)
             
-            # Check if element is truly visible and interactable
-            if not element.is_displayed() or not element.is_enabled():
-                return False
-                
-            # Try to move mouse to element
-            actions = ActionChains(self.driver)
-            actions.move_to_element(element).perform()
-            time.sleep(0.5)
+            # Only elements revealed by :hover styles need the mouse moved over them
+            if hover:
+                ActionChains(self.driver).move_to_element(element).perform()
             
-            return True
+            # Check if element is truly visible and interactable
+            return element.is_displayed() and element.is_enabled()
         except Exception as e:
             logging.error(f"Error ensuring element interactability: {e}")
             return False
@@ -262,25 +496,12 @@ class BDOFormFiller:
             # Clear existing text
             try:
                 element.clear()
-                time.sleep(0.5)
             except:
                 element.send_keys(Keys.CONTROL + "a")
                 element.send_keys(Keys.DELETE)
-                time.sleep(0.5)
-                
-            # Type text with random delays
-            for char in text:
-                element.send_keys(char)
-                time.sleep(random.uniform(0.1, 0.3))
-                
-            # Verify input
-            actual_value = element.get_attribute('value')
-            if actual_value != text:
-                self.driver.execute_script(
-                    "arguments[0].value = arguments[1];",
-                    element, text
-                )
                 
+            # Type the whole value in one command
+            element.send_keys(text)
             return True
         except Exception as e:
             logging.error(f"Error filling input {locator.name}: {e}")
@@ -303,14 +524,13 @@ class BDOFormFiller:
             # Try multiple selection methods
             methods = [
                 lambda: Select(element).select_by_value(code),
-                lambda: (element.click(), time.sleep(0.5), element.send_keys(code), element.send_keys(Keys.ENTER)),
+                lambda: (element.click(), element.send_keys(code), element.send_keys(Keys.ENTER)),
                 lambda: self.driver.execute_script(f"arguments[0].value = '{code}';", element)
             ]
             
             for method in methods:
                 try:
                     method()
-                    time.sleep(1)
                     # Verify selection
                     value = element.get_attribute('value')
                     if value and code in value:
@@ -336,366 +556,467 @@ class BDOFormFiller:
             if not self.ensure_element_interactable(element):
                 return False
 
-            # Try multiple click methods
-            methods = [
-                lambda: element.click(),
-                lambda: self.driver.execute_script("arguments[0].click();", element),
-                lambda: ActionChains(self.driver).move_to_element(element).click().perform(),
-                lambda: element.send_keys(Keys.RETURN)
-            ]
-
-            for method in methods:
-                try:
-                    method()
-                    time.sleep(1)
-                    return True
-                except:
-                    continue
-
-            return False
+            # Click the element centre with a native mouse event
+            x, y = self.driver.execute_script(
+                "const r = arguments[0].getBoundingClientRect();"
+                "return [r.left + r.width / 2, r.top + r.height / 2];",
+                element
+            )
+            for event_type in ("mousePressed", "mouseReleased"):
+                self.driver.execute_cdp_cmd("Input.dispatchMouseEvent", {
+                    "type": event_type,
+                    "x": x,
+                    "y": y,
+                    "button": "left",
+                    "clickCount": 1
+                })
+            return True
         except Exception as e:
             logging.error(f"Error clicking button {locator.name}: {e}")
             return False
 
-    def handle_popup(self) -> bool:
-        """Handle the confirmation popup"""
+    def _fill_and_submit(self, form_data: Dict[str, str], reuse_page: bool = False) -> Tuple[bool, bool]:
+        """Fill and submit the form in one page evaluation, then confirm the popup.
+        Returns (success, whether Next was clicked)"""
+        fill_fn = "window.__resetAndFill" if reuse_page else "window.__fillForm"
         try:
-            # Wait for popup OK button
-            ok_button = self.wait.until(
-                EC.presence_of_element_located((By.ID, "personalbtn"))
+            status = self.evaluate(f"{fill_fn}({json.dumps(form_data)})")
+        except WebDriverException as e:
+            logging.error(f"Form submission failed: {e}")
+            return False, False
+        if status != 'clicked':
+            logging.error(f"Form submission failed: {status}")
+            return False, False
+        
+        # Wait up to 5 seconds for the popup and click OK, polling across the postback's page load
+        try:
+            WebDriverWait(self.driver, 5, poll_frequency=POLL_INTERVAL,
+                          ignored_exceptions=(WebDriverException,)).until(
+                lambda d: d.execute_script(CLICK_POPUP_JS, FormLocators.OK_BUTTON_ID)
             )
-            if ok_button and ok_button.is_displayed():
-                try:
-                    ok_button.click()
-                except:
-                    self.driver.execute_script("arguments[0].click();", ok_button)
-                time.sleep(0.5)
-                return True
-            return False
-        except Exception as e:
-            logging.error(f"Error handling popup: {e}")
-            return False
+        except TimeoutException:
+            logging.error("Form submission failed: popup button not found")
+            return False, True
+
+        # Wait for the confirmation popup to close instead of a fixed delay
+        try:
+            WebDriverWait(self.driver, 5).until(lambda d: not d.execute_script(
+                "const btn = document.getElementById(arguments[0]);"
+                "return !!btn && btn.offsetParent !== null;",
+                FormLocators.OK_BUTTON_ID
+            ))
+        except TimeoutException:
+            logging.warning("Confirmation popup still visible after submission")
+        return True, True
 
-    def fill_form(self, phone_number: str) -> bool:
-        """Fast form filling with exact selectors and proper delays"""
+    def _submit_row(self, row: Dict[str, str], reuse_page: bool = False) -> Tuple[bool, bool]:
+        """Fill and submit one prepared row, returning (success, whether Next was clicked)"""
         if not isinstance(self.driver, webdriver.Chrome):
-            return False
+            return False, False
 
         try:
-            # Fill form using JavaScript with exact IDs and proper sequence
-            fill_script = """
-                try {
-                    // Set country code first
-                    const countryCode = document.getElementById('codrp');
-                    if (!countryCode) return false;
-                    countryCode.value = '+92';
-                    countryCode.dispatchEvent(new Event('change', {bubbles: true}));
-                    countryCode.dispatchEvent(new Event('input', {bubbles: true}));
-
-                    // Fill other fields
-                    const fillField = (id, value) => {
-                        const el = document.getElementById(id);
-                        if (!el) return false;
-                        el.value = value;
-                        el.dispatchEvent(new Event('change', {bubbles: true}));
-                        el.dispatchEvent(new Event('input', {bubbles: true}));
-                        return true;
-                    };
-
-                    const data = arguments[0];
-                    if (!fillField('firstname', data.firstName)) return false;
-                    if (!fillField('lastname', data.lastName)) return false;
-                    if (!fillField('posttext', data.phone)) return false;
-                    if (!fillField('emailaddress1', data.email)) return false;
-
-                    return true;
-                } catch (e) {
-                    console.error(e);
-                    return false;
-                }
-            """
-
-            # Prepare form data
-            form_data = {
-                'firstName': phone_number[:20],
-                'lastName': phone_number[:20],
-                'phone': phone_number[-11:],
-                'email': f"{phone_number}@gmail.com"[:40]
-            }
+            return self._fill_and_submit(build_form_data(row), reuse_page)
+        except Exception as e:
+            # Next may already have been clicked, so the row must not be submitted again
+            logging.error(f"Error in form filling: {e}")
+            return False, True
 
-            # Fill the form
-            if not self.driver.execute_script(fill_script, form_data):
-                logging.error("Failed to fill form fields")
-                return False
+    def fill_form(self, row: Dict[str, str], reuse_page: bool = False) -> bool:
+        """Fill and submit the form for one prepared row"""
+        return self._submit_row(row, reuse_page)[0]
 
-            # Wait for 2 seconds after filling
-            time.sleep(2)
-
-            # Find and click the next button using multiple methods
-            try:
-                # Try using exact input name first
-                next_button = self.driver.find_element(By.NAME, "ctl00$ContentContainer$WebFormControl_50052ed5c76aeb11a812002248167989$NextButton")
-                if next_button:
-                    self.driver.execute_script("arguments[0].click();", next_button)
-                    time.sleep(2)
-            except:
-                try:
-                    # Try using ID if name fails
-                    next_button = self.driver.find_element(By.ID, "NextButton")
-                    if next_button:
-                        self.driver.execute_script("arguments[0].click();", next_button)
-                        time.sleep(2)
-                except:
-                    # Try using JavaScript if both fail
-                    click_script = """
-                        try {
-                            const nextBtn = document.querySelector('input[type="button"][value="Next"]');
-                            if (nextBtn) {
-                                nextBtn.click();
-                                return true;
-                            }
-                            return false;
-                        } catch (e) {
-                            return false;
-                        }
-                    """
-                    if not self.driver.execute_script(click_script):
-                        logging.error("Failed to click next button")
-                        return False
-
-            # Wait for popup and click OK
-            try:
-                # Wait up to 5 seconds for popup
-                popup_btn = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable((By.ID, "personalbtn"))
-                )
-                if popup_btn:
-                    self.driver.execute_script("arguments[0].click();", popup_btn)
-                    time.sleep(2)
-                    return True
-            except TimeoutException:
-                logging.error("Popup button not found")
-                return False
+    def fill_next(self, row: Dict[str, str]) -> bool:
+        """Fill the next number, reusing the loaded page while it keeps succeeding"""
+        reuse_page = self._page_uses > 0
+        if not reuse_page:
+            self.navigate()
+            
+        success, submitted = self._submit_row(row, reuse_page=reuse_page)
+        if not success and not submitted and reuse_page:
+            # The reused page went stale before Next was clicked; retry this number once from scratch
+            self.reset_session()
+            self.navigate()
+            success = self.fill_form(row)
+        self._page_uses += 1
+        if not success or self._page_uses >= MAX_PAGE_REUSES:
+            # Start the next number from a fresh page and session
+            self.reset_session()
+            self._page_uses = 0
+        return success
 
+    def reset_session(self) -> None:
+        """Clear cookies and local storage so the browser can take the next number"""
+        if not isinstance(self.driver, webdriver.Chrome):
+            return
+        try:
+            self.driver.delete_all_cookies()
+            self.driver.execute_script("window.localStorage.clear();")
         except Exception as e:
-            logging.error(f"Error in form filling: {e}")
-            return False
-
-        return False
+            logging.warning(f"Error resetting browser session: {e}")
 
     def process_single_number(self, phone_number: str) -> bool:
-        """Process single number with proper cleanup"""
-        success = False
+        """Process single number, reusing the warm browser when available"""
         try:
-            if self.setup_driver():
-                success = self.fill_form(phone_number)
-                if success:
-                    time.sleep(1)  # Brief delay after success
-                    return True
-                time.sleep(2)  # Longer delay after failure
+            if isinstance(self.driver, webdriver.Chrome):
+                self.navigate()
+            elif not self.setup_driver():
+                return False
+            
+            if self.fill_form(prepare_rows(pd.Series([phone_number]))[0]):
+                return True
+            time.sleep(2)  # Longer delay after failure
         except Exception as e:
             logging.error(f"Error processing number {phone_number}: {e}")
         finally:
-            if hasattr(self, 'driver') and self.driver:
-                try:
-                    if success:
-                        # If successful, quit immediately without retries
-                        self.driver.quit()
-                    else:
-                        # Only retry connection if failed
-                        try:
-                            self.driver.quit()
-                        except:
-                            pass
-                except:
-                    pass
+            # Clear session state instead of quitting the browser
+            self.reset_session()
+        return False
+
+def prepare_rows(phone_numbers: pd.Series) -> List[Dict[str, str]]:
+    """Slice phone numbers into form field values with vectorized string ops"""
+    df = pd.DataFrame({'phone_number': phone_numbers.astype(str)})
+    df['first'] = df['phone_number'].str[:20]
+    df['phone11'] = df['phone_number'].str[-11:]
+    df['email'] = (df['phone_number'] + '@gmail.com').str[:40]
+    return df[['phone_number', 'first', 'phone11', 'email']].to_dict('records')
+
+# Browser owned by the current worker process, created once by _init_worker
+_worker_filler: Optional[BDOFormFiller] = None
+
+def _init_worker() -> None:
+    """Start this worker process's browser and quit it when the process exits"""
+    global _worker_filler
+    Finalize(None, _close_worker, exitpriority=10)
+    try:
+        _worker_filler = BDOFormFiller()
+    except Exception as e:
+        # Leave it to _process_one to retry, rather than breaking the whole pool
+        logging.error(f"Error starting worker browser: {e}")
+
+def _close_worker() -> None:
+    """Quit the worker process's browser"""
+    if _worker_filler and _worker_filler.driver:
+        quit_driver(_worker_filler.driver)
+
+def _process_one(row: Dict[str, str]) -> bool:
+    """Fill the form for one number on this worker process's browser"""
+    global _worker_filler
+    if _worker_filler is None:
+        _worker_filler = BDOFormFiller()
+    try:
+        # Type guard for driver
+        if not isinstance(_worker_filler.driver, webdriver.Chrome):
+            raise Exception("Driver not properly initialized")
+        
+        return _worker_filler.fill_next(row)
+    except Exception:
+        # Swap in a fresh browser so later numbers are not affected
+        try:
+            _close_worker()
+            _worker_filler = BDOFormFiller()
+        except Exception as e:
+            logging.error(f"Error replacing browser: {e}")
+        raise
+
+class _FormFieldParser(HTMLParser):
+    """Collect hidden field values and id -> name mappings from the form page"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.hidden: Dict[str, str] = {}
+        self.names_by_id: Dict[str, str] = {}
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag not in ('input', 'select', 'textarea'):
+            return
+        attr = dict(attrs)
+        name = attr.get('name')
+        if not name:
+            return
+        if attr.get('id'):
+            self.names_by_id[attr['id']] = name
+        if tag == 'input' and (attr.get('type') or '').lower() == 'hidden':
+            self.hidden[name] = attr.get('value') or ''
+
+def _needs_browser(response: httpx.Response) -> bool:
+    """Check whether a response is a CAPTCHA or anti-bot page"""
+    if response.status_code in (403, 429):
+        return True
+    text = response.text.lower()
+    return any(marker in text for marker in BOT_CHECK_MARKERS)
+
+def _postback_succeeded(response: httpx.Response) -> bool:
+    """Check a postback response for the configured success marker"""
+    # Error statuses and redirects to an error page are failures, whatever the body says
+    if not response.is_success:
         return False
+    for hop in (*response.history, response):
+        location = str(hop.url).lower()
+        if any(marker in location for marker in ERROR_PATH_MARKERS):
+            return False
+    # personalbtn is in the form markup whether or not the popup shows, so only an
+    # explicit marker of the accepted submission counts
+    return bool(HTTP_SUCCESS_MARKER) and HTTP_SUCCESS_MARKER in response.text
+
+def _session_cookie_header(page: httpx.Response) -> Dict[str, str]:
+    """Build the Cookie header for a postback from the cookies set while loading its form"""
+    cookies: Dict[str, str] = {}
+    for response in (*page.history, page):
+        cookies.update(response.cookies.items())
+    if not cookies:
+        return {}
+    return {'Cookie': '; '.join(f"{name}={value}" for name, value in cookies.items())}
+
+async def _post_form(client: httpx.AsyncClient, semaphore: asyncio.Semaphore,
+                     row: Dict[str, str]) -> Optional[bool]:
+    """Submit one number as a direct WebForms postback; None means use a browser"""
+    async with semaphore:
+        # Harvest __VIEWSTATE, __EVENTVALIDATION and the real field names
+        try:
+            page = await client.get(FORM_URL)
+        except httpx.HTTPError as e:
+            logging.warning(f"Error loading form over HTTP: {e}")
+            return None
+        if _needs_browser(page):
+            return None
+        
+        parser = _FormFieldParser()
+        parser.feed(page.text)
+        names = parser.names_by_id
+        fields = {FormLocators.FIELD_IDS[key]: value for key, value in build_form_data(row).items()}
+        if '__VIEWSTATE' not in parser.hidden or FormLocators.NEXT_BUTTON_ID not in names \
+                or any(field_id not in names for field_id in fields):
+            return None
+        
+        payload = dict(parser.hidden)
+        payload.update({names[field_id]: value for field_id, value in fields.items()})
+        payload['__EVENTTARGET'] = names[FormLocators.NEXT_BUTTON_ID]
+        payload['__EVENTARGUMENT'] = ''
+        
+        # Once the postback is sent, errors count as failures rather than retrying in a browser
+        try:
+            response = await client.post(str(page.url), data=payload,
+                                         headers=_session_cookie_header(page))
+        except httpx.HTTPError as e:
+            logging.error(f"Error posting form for {row['phone_number']}: {e}")
+            return False
+        if _needs_browser(response):
+            return None
+        return _postback_succeeded(response)
 
-def process_batch(phone_numbers: List[str], max_tabs: int = 20) -> Tuple[List[str], List[str]]:
-    """Process multiple numbers simultaneously with parallel form filling"""
+def submit_http_batch(rows: List[Dict[str, str]]) -> List[Optional[bool]]:
+    """Submit rows concurrently over HTTP; None entries still need a browser"""
+    async def run() -> List[Optional[bool]]:
+        semaphore = asyncio.Semaphore(HTTP_CONCURRENCY)
+        # One client keeps connections pooled across rows. Its jar stores no cookies, so
+        # concurrent rows never share a session; each postback sends its own form's cookies
+        jar = CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+        async with httpx.AsyncClient(timeout=HTTP_TIMEOUT, follow_redirects=True,
+                                     cookies=jar) as client:
+            return await asyncio.gather(*(_post_form(client, semaphore, row) for row in rows))
+    return asyncio.run(run())
+
+def process_batch(rows: Iterable[Dict[str, str]], max_tabs: int = 20,
+                  total: Optional[int] = None,
+                  on_result: Optional[Callable[[str, bool], None]] = None,
+                  use_http: bool = False) -> Tuple[List[str], List[str]]:
+    """Process multiple numbers in parallel, one warm browser per worker process"""
     successful, failed = [], []
-    total = len(phone_numbers)
+    workers = max(1, min(max_tabs, os.cpu_count() or 1))
+    
+    def record(phone: str, success: bool) -> None:
+        (successful if success else failed).append(phone)
+        if on_result:
+            on_result(phone, success)
+        
+        # Show progress after every round of one number per worker
+        processed = len(successful) + len(failed)
+        if processed % workers == 0 or processed == total:
+            success_rate = (len(successful) / processed) * 100
+            if total:
+                print(f"\nBatch Progress: {processed}/{total} ({processed/total*100:.1f}%)")
+            else:
+                print(f"\nBatch Progress: {processed}")
+            print(f"Success rate: {success_rate:.1f}%")
+    
+    def report(phone: str, success: bool) -> None:
+        if success:
+            print(f"✓ Successfully processed: {phone}")
+        else:
+            print(f"✗ Failed to process: {phone}")
+        record(phone, success)
     
-    print(f"\nProcessing {total} numbers...")
+    # Rows are read, and optionally tried over HTTP, on a feeder thread so the browser
+    # pool keeps working meanwhile. A None result means the row still needs a browser
+    feed: "queue.Queue[Optional[Tuple[Dict[str, str], Optional[bool]]]]" = queue.Queue(HTTP_CHUNK_SIZE)
+    # Set when the batch fails, so the feeder hands back the remaining rows without submitting them
+    stop = threading.Event()
     
-    # Process first batch of 20 numbers, then remaining in smaller batches
-    remaining_numbers = phone_numbers.copy()
-    while remaining_numbers:
-        form_filler = None
+    def feed_rows() -> None:
         try:
-            # Initialize browser for this batch
-            form_filler = BDOFormFiller()
-            if not form_filler.setup_driver() or not form_filler.driver:
-                raise Exception("Failed to initialize browser")
-            
-            # Determine batch size - first batch 20, then smaller batches
-            current_batch_size = 20 if len(successful) + len(failed) == 0 else max_tabs
-            batch = remaining_numbers[:current_batch_size]
-            remaining_numbers = remaining_numbers[current_batch_size:]
-            
-            # Type guard for driver
-            driver = form_filler.driver
-            if not isinstance(driver, webdriver.Chrome):
-                raise Exception("Driver not properly initialized")
-
-            # Create all tabs at once using JavaScript
-            tabs_script = "".join([
-                "window.open('');" for _ in range(len(batch) - 1)
-            ])
-            driver.execute_script(tabs_script)
-            
-            # Get all handles
-            handles = driver.window_handles
-            active_tabs = {}  # handle -> phone_number
-            
-            # Navigate to form URL in all tabs simultaneously
-            for i, phone in enumerate(batch):
-                active_tabs[handles[i]] = phone
-            
-            # Open URLs in all tabs simultaneously using JavaScript
-            for handle, phone in active_tabs.items():
-                driver.switch_to.window(handle)
-                driver.get(form_filler.url)
-            
-            # Wait briefly for all tabs to load
-            time.sleep(1)
-            
-            # Fill all forms simultaneously
-            for handle, phone in active_tabs.items():
-                driver.switch_to.window(handle)
-                # Fill form using fast JavaScript
-                driver.execute_script("""
-                    try {
-                        // Set country code
-                        const countryCode = document.getElementById('codrp');
-                        if (countryCode) {
-                            countryCode.value = '+92';
-                            countryCode.dispatchEvent(new Event('change'));
-                        }
-                        
-                        // Fill all fields at once
-                        const data = arguments[0];
-                        const fields = {
-                            'firstname': data.firstName,
-                            'lastname': data.lastName,
-                            'posttext': data.phone,
-                            'emailaddress1': data.email
-                        };
-                        
-                        Object.entries(fields).forEach(([id, value]) => {
-                            const el = document.getElementById(id);
-                            if (el) {
-                                el.value = value;
-                                el.dispatchEvent(new Event('change', {bubbles: true}));
-                                el.dispatchEvent(new Event('input', {bubbles: true}));
-                            }
-                        });
-                    } catch (e) {
-                        console.error(e);
-                    }
-                """, {
-                    'firstName': phone[:20],
-                    'lastName': phone[:20],
-                    'phone': phone[-11:],
-                    'email': f"{phone}@gmail.com"[:40]
-                })
-            
-            # Submit all forms simultaneously
-            for handle, phone in active_tabs.items():
-                driver.switch_to.window(handle)
-                try:
-                    # Click next button
-                    next_button = driver.execute_script("""
-                        const btn = document.querySelector('input[type="button"][value="Next"], button.next, button.submit-btn');
-                        if (btn) {
-                            btn.click();
-                            return true;
-                        }
-                        return false;
-                    """)
-                    
-                    if next_button:
-                        try:
-                            # Handle popup quickly
-                            popup_btn = WebDriverWait(driver, 3).until(
-                                EC.element_to_be_clickable((By.ID, "personalbtn"))
-                            )
-                            if popup_btn:
-                                driver.execute_script("arguments[0].click();", popup_btn)
-                                successful.append(phone)
-                                print(f"✓ Successfully processed: {phone}")
-                                continue
-                        except:
-                            pass
-                    failed.append(phone)
-                    print(f"✗ Failed to process: {phone}")
-                except Exception as e:
-                    print(f"✗ Error completing form for {phone}: {e}")
-                    failed.append(phone)
-            
-            # Show batch progress
-            processed = total - len(remaining_numbers)
-            success_rate = (len(successful) / processed) * 100 if processed > 0 else 0
-            print(f"\nBatch Progress: {processed}/{total} ({processed/total*100:.1f}%)")
-            print(f"Success rate: {success_rate:.1f}%")
-            
+            rows_iter = iter(rows)
+            while True:
+                chunk = list(islice(rows_iter, HTTP_CHUNK_SIZE))
+                if not chunk:
+                    return
+                submit = use_http and not stop.is_set()
+                results = submit_http_batch(chunk) if submit else [None] * len(chunk)
+                for item in zip(chunk, results):
+                    feed.put(item)
         except Exception as e:
-            print(f"Error in batch processing: {e}")
-            logging.error(f"Error in batch processing: {e}")
-            # Add remaining numbers in batch to failed
-            for phone in batch:
-                if phone not in successful and phone not in failed:
-                    failed.append(phone)
-                    
+            logging.error(f"Error reading rows: {e}")
         finally:
-            # Clean up browser
-            if form_filler and form_filler.driver:
-                try:
-                    form_filler.driver.quit()
-                except:
-                    pass
-            kill_chrome()
-            time.sleep(1)
+            feed.put(None)
+    
+    print(f"\nProcessing {total if total is not None else 'all'} numbers...")
+    
+    pending: Dict[Future, str] = {}
+    waiting: "deque[Dict[str, str]]" = deque()
+    exhausted = False
+    
+    def take_rows(block: bool) -> None:
+        # Report HTTP results and queue browser rows, holding only a few rows back
+        nonlocal exhausted
+        while not exhausted and len(waiting) < workers:
+            try:
+                item = feed.get(block=block)
+            except queue.Empty:
+                return
+            block = False
+            if item is None:
+                exhausted = True
+                return
+            row, result = item
+            if result is None:
+                waiting.append(row)
+            else:
+                report(row['phone_number'], result)
+    
+    try:
+        threading.Thread(target=feed_rows, daemon=True).start()
+        
+        # Each process starts its own browser and chromedriver once and reuses them
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            while True:
+                # Block for rows only while no browser work is in flight
+                take_rows(block=not pending)
+                while waiting and len(pending) < workers * 2:
+                    # Only dequeue once submitted, so a failed submit leaves the row accounted for
+                    future = executor.submit(_process_one, waiting[0])
+                    pending[future] = waiting.popleft()['phone_number']
+                if not pending:
+                    if exhausted:
+                        break
+                    continue
+                
+                # Wake up periodically to report HTTP results while the feeder is still running
+                done, _ = wait_futures(pending, timeout=None if exhausted else POLL_INTERVAL,
+                                       return_when=FIRST_COMPLETED)
+                for future in done:
+                    phone = pending.pop(future)
+                    try:
+                        success = future.result()
+                    except Exception as e:
+                        print(f"✗ Error completing form for {phone}: {e}")
+                        logging.error(f"Error completing form for {phone}: {e}")
+                        record(phone, False)
+                        continue
+                    report(phone, success)
+            
+    except Exception as e:
+        print(f"Error in batch processing: {e}")
+        logging.error(f"Error in batch processing: {e}")
+        stop.set()
+        # In-flight numbers that finished before the failure keep their result; the rest failed
+        for future, phone in pending.items():
+            if future.done() and not future.cancelled() and future.exception() is None:
+                report(phone, future.result())
+            else:
+                record(phone, False)
+        
+        # Numbers queued for a browser, or not yet handed over by the feeder, were never processed
+        for row in waiting:
+            record(row['phone_number'], False)
+        while not exhausted:
+            item = feed.get()
+            if item is None:
+                break
+            row, result = item
+            if result is None:
+                record(row['phone_number'], False)
+            else:
+                report(row['phone_number'], result)
     
     return successful, failed
 
+def read_rows(path: str, chunk_size: int = 1000) -> Tuple[int, Iterator[Dict[str, str]]]:
+    """Stream phone numbers from Excel, preparing them one chunk at a time"""
+    wb = load_workbook(path, read_only=True, data_only=True)
+    ws = wb.active
+    header = next(ws.iter_rows(max_row=1, values_only=True), ())
+    column = list(header).index('phone_number')
+    total = max((ws.max_row or 1) - 1, 0)
+    
+    def rows() -> Iterator[Dict[str, str]]:
+        try:
+            chunk: List[Any] = []
+            for values in ws.iter_rows(min_row=2, values_only=True):
+                if column < len(values) and values[column] is not None:
+                    chunk.append(values[column])
+                if len(chunk) >= chunk_size:
+                    yield from prepare_rows(pd.Series(chunk, dtype=object))
+                    chunk = []
+            if chunk:
+                yield from prepare_rows(pd.Series(chunk, dtype=object))
+        finally:
+            wb.close()
+    
+    return total, rows()
+
 def main():
     """Main function with improved stability"""
+    results_wb = None
     try:
-        # Initial cleanup
-        kill_chrome()
-        time.sleep(2)
-        
-        # Read numbers
-        df = pd.read_excel('phone_numbers.xlsx')
-        phone_numbers = df['phone_number'].astype(str).tolist()
-        total_numbers = len(phone_numbers)
+        # Stream numbers from the sheet
+        total_numbers, rows = read_rows('phone_numbers.xlsx')
         
         print(f"Found {total_numbers} numbers to process")
         
-        # Process numbers
-        successful_numbers, failed_numbers = process_batch(phone_numbers)
+        # Results are written as each number completes
+        results_wb = Workbook(write_only=True)
+        results_ws = results_wb.create_sheet()
+        results_ws.append(['phone_number', 'status', 'timestamp'])
         
-        # Save results
-        results_df = pd.DataFrame({
-            'phone_number': successful_numbers + failed_numbers,
-            'status': ['success'] * len(successful_numbers) + ['failed'] * len(failed_numbers),
-            'timestamp': [time.strftime("%Y-%m-%d %H:%M:%S")] * (len(successful_numbers) + len(failed_numbers))
-        })
-        results_df.to_excel('form_results.xlsx', index=False)
+        def save_result(phone: str, success: bool) -> None:
+            results_ws.append([phone, 'success' if success else 'failed', time.strftime("%Y-%m-%d %H:%M:%S")])
+        
+        # The HTTP fast path is opt-in and needs a success marker taken from a real accepted response
+        use_http = os.getenv('BDO_HTTP_FAST_PATH') == '1'
+        if use_http and not HTTP_SUCCESS_MARKER:
+            print("BDO_HTTP_FAST_PATH needs BDO_HTTP_SUCCESS_MARKER; submitting through the browser only")
+            logging.warning("BDO_HTTP_FAST_PATH set without BDO_HTTP_SUCCESS_MARKER, fast path disabled")
+            use_http = False
+        
+        # Process numbers
+        successful_numbers, failed_numbers = process_batch(rows, total=total_numbers,
+                                                           on_result=save_result, use_http=use_http)
         
         # Show final summary
+        processed = len(successful_numbers) + len(failed_numbers)
         print("\n=== Final Results ===")
         print(f"✓ Total Successful: {len(successful_numbers)}")
         print(f"✗ Total Failed: {len(failed_numbers)}")
-        print(f"Final Success Rate: {(len(successful_numbers)/total_numbers*100):.1f}%")
-        print("Results saved to form_results.xlsx")
+        if processed:
+            print(f"Final Success Rate: {(len(successful_numbers)/processed*100):.1f}%")
         
     except Exception as e:
         print(f"Error in main process: {e}")
         logging.error(f"Error in main process: {e}")
     finally:
-        kill_chrome()
+        # Keep every result recorded so far, even when the run is interrupted
+        if results_wb is not None:
+            results_wb.save('form_results.xlsx')
+            print("Results saved to form_results.xlsx")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
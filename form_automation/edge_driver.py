@@ -0,0 +1,40 @@
+from selenium import webdriver
+from selenium.webdriver.edge.service import Service
+from selenium.webdriver.edge.options import Options
+from webdriver_manager.microsoft import EdgeChromiumDriverManager
+from functools import lru_cache
+import os
+
+@lru_cache(maxsize=None)
+def edge_driver_path() -> str:
+    """Return the msedgedriver path, resolving it at most once per process"""
+    path = os.environ.get('EDGE_DRIVER_PATH')
+    if path:
+        return path
+    # Keep webdriver-manager quiet and cache the driver in .wdm/ next to the scripts
+    os.environ.setdefault('WDM_LOG_LEVEL', '0')
+    os.environ.setdefault('WDM_LOCAL', '1')
+    return EdgeChromiumDriverManager().install()
+
+def create_edge_driver(headless: bool = False) -> webdriver.Edge:
+    """Start an Edge session with the options shared by the analyzer and the filler"""
+    edge_options = Options()
+    # Inputs exist by DOMContentLoaded, so don't wait for every subresource
+    edge_options.page_load_strategy = 'eager'
+    edge_options.add_argument('--start-maximized')
+    edge_options.add_argument('--disable-blink-features=AutomationControlled')
+    edge_options.add_argument('--disable-notifications')
+    edge_options.add_argument('--inprivate')
+    edge_options.add_argument('--blink-settings=imagesEnabled=false')
+    if headless:
+        edge_options.add_argument('--headless=new')
+        edge_options.add_argument('--disable-gpu')
+    edge_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    edge_options.add_experimental_option('useAutomationExtension', False)
+    # Images are never needed; stylesheets stay because visibility checks rely on them
+    edge_options.add_experimental_option('prefs', {
+        'profile.managed_default_content_settings.images': 2
+    })
+
+    service = Service(edge_driver_path())
+    return webdriver.Edge(service=service, options=edge_options)
@@ -1,20 +1,13 @@
 from selenium import webdriver
-from selenium.webdriver.edge.service import Service
-from selenium.webdriver.edge.options import Options
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.wait import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException, NoSuchElementException
-from selenium.webdriver.remote.webelement import WebElement
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
-from typing import List, Dict, Optional, Union, Any
-import pandas as pd
+from edge_driver import create_edge_driver
+from form_filler import FormFiller
+from typing import List, Dict, Optional, Union
 from openpyxl import Workbook
 from openpyxl.worksheet.datavalidation import DataValidation
 from openpyxl.utils import get_column_letter
+import argparse
 import logging
-import time
-import os
 
 # Setup logging
 logging.basicConfig(
@@ -26,6 +19,28 @@ logging.basicConfig(
     ]
 )
 
+# Resolves a field's label from label[for=id], an ancestor label, then a sibling label
+_FIND_LABEL_JS = """
+const findLabel = el => {
+    let label = el.id && document.querySelector(`label[for="${CSS.escape(el.id)}"]`);
+    if (!label) label = el.closest('label');
+    if (!label && el.parentElement) label = el.parentElement.querySelector(':scope > label');
+    return label ? label.innerText.trim() : '';
+};
+"""
+
+# Collects every non-hidden form field with its label in one round-trip
+_FIELDS_JS = _FIND_LABEL_JS + """
+return [...document.querySelectorAll('input:not([type=hidden]), select, textarea')].map(el => ({
+    name: el.getAttribute('name') || el.id || '',
+    id: el.id || '',
+    type: el.type || 'text',
+    placeholder: el.getAttribute('placeholder') || '',
+    label: findLabel(el),
+    required: el.hasAttribute('required') || el.getAttribute('aria-required') === 'true'
+}));
+"""
+
 class FormField:
     """Class to represent a form field"""
     def __init__(self, name: str, field_type: str, label: str, required: bool = False):
@@ -43,26 +58,18 @@ class FormField:
         }
 
 class FormAnalyzer:
-    def __init__(self, url: str):
-        """Initialize the form analyzer"""
+    def __init__(self, url: str, driver: Optional[webdriver.Edge] = None):
+        """Initialize the form analyzer, optionally on a browser session owned by the caller"""
         self.url = url
-        self.driver: Optional[webdriver.Edge] = None
-        self.wait: Optional[WebDriverWait] = None
+        self.driver: Optional[webdriver.Edge] = driver
+        self.wait: Optional[WebDriverWait] = WebDriverWait(driver, 10) if driver else None
+        self._owns_driver = driver is None
         self.form_fields: List[FormField] = []
         
-    def setup_driver(self) -> None:
+    def setup_driver(self, headless: bool = False) -> None:
         """Initialize Edge driver with custom options"""
         try:
-            edge_options = Options()
-            edge_options.add_argument('--start-maximized')
-            edge_options.add_argument('--disable-blink-features=AutomationControlled')
-            edge_options.add_argument('--disable-notifications')
-            edge_options.add_argument('--inprivate')
-            edge_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            edge_options.add_experimental_option('useAutomationExtension', False)
-            
-            service = Service(EdgeChromiumDriverManager().install())
-            self.driver = webdriver.Edge(service=service, options=edge_options)
+            self.driver = create_edge_driver(headless)
             self.wait = WebDriverWait(self.driver, 10)
             logging.info("Browser setup completed successfully")
             
@@ -73,95 +80,40 @@ class FormAnalyzer:
             self.driver = None
             raise
 
-    def find_label_text(self, field: WebElement) -> str:
-        """Find label text for a form field using multiple strategies"""
-        if not self.driver:
-            return ""
-            
-        field_id = field.get_attribute('id')
-        if field_id:
-            try:
-                label_elem = self.driver.find_element(By.CSS_SELECTOR, f"label[for='{field_id}']")
-                if label_elem:
-                    return label_elem.text.strip()
-            except NoSuchElementException:
-                pass
-
-        try:
-            # Look for label as ancestor
-            label_elem = field.find_element(By.XPATH, "./ancestor::label")
-            if label_elem:
-                return label_elem.text.strip()
-        except NoSuchElementException:
-            pass
-
-        try:
-            # Look for label as sibling
-            label_elem = field.find_element(By.XPATH, "../label")
-            if label_elem:
-                return label_elem.text.strip()
-        except NoSuchElementException:
-            pass
-
-        return ""
-
-    def get_field_info(self, field: WebElement) -> Optional[FormField]:
-        """Extract information about a form field"""
-        try:
-            field_type = field.get_attribute('type') or 'text'
-            field_id = field.get_attribute('id') or ''
-            field_name = field.get_attribute('name') or field_id
-            field_placeholder = field.get_attribute('placeholder') or ''
-            
-            # Get label text
-            label = self.find_label_text(field)
-            
-            # Use the best available name for the field
-            field_label = label or field_placeholder or field_name or field_id
-            if not field_label:
-                return None
-                
-            required = field.get_attribute('required') is not None or field.get_attribute('aria-required') == 'true'
-            
-            return FormField(
-                name=field_name,
-                field_type=field_type,
-                label=field_label,
-                required=required
-            )
-            
-        except Exception as e:
-            logging.error(f"Error getting field info: {e}")
-            return None
-
     def analyze_form(self) -> None:
         """Analyze form fields"""
         try:
-            self.setup_driver()
+            if self._owns_driver:
+                self.setup_driver()
             if not self.driver or not self.wait:
                 return
             
             # Navigate to the form URL
             self.driver.get(self.url)
-            time.sleep(2)  # Wait for page load
-            
-            # Find all input fields
-            input_elements = self.wait.until(EC.presence_of_all_elements_located(
-                (By.XPATH, "//input[not(@type='hidden')] | //select | //textarea")
-            ))
             
-            for field in input_elements:
-                field_info = self.get_field_info(field)
-                if field_info:
-                    self.form_fields.append(field_info)
-                    logging.info(f"Found field: {field_info.label} ({field_info.field_type})")
+            # Extract all fields in a single script, waiting until at least one exists
+            fields = self.wait.until(lambda d: d.execute_script(_FIELDS_JS) or False)
+            
+            for field in fields:
+                # Use the best available name for the field
+                field_label = field['label'] or field['placeholder'] or field['name'] or field['id']
+                if not field_label:
+                    continue
+                field_info = FormField(
+                    name=field['name'],
+                    field_type=field['type'],
+                    label=field_label,
+                    required=field['required']
+                )
+                self.form_fields.append(field_info)
+                logging.info(f"Found field: {field_info.label} ({field_info.field_type})")
             
             logging.info(f"Found {len(self.form_fields)} form fields")
             
         except Exception as e:
             logging.error(f"Error analyzing form: {e}")
         finally:
-            if self.driver:
+            if self.driver and self._owns_driver:
                 self.driver.quit()
 
     def create_excel_template(self) -> None:
@@ -213,11 +165,21 @@ class FormAnalyzer:
 
 def main() -> None:
     """Main function to run the form analyzer"""
+    parser = argparse.ArgumentParser(description="Detect a web form's fields and write an Excel template")
+    parser.add_argument('--headless', action='store_true',
+                        help="run Edge without a window, e.g. on CI")
+    parser.add_argument('--fill', action='store_true',
+                        help="after creating the template, submit it in the same browser once it is filled")
+    args = parser.parse_args()
+    
+    # One browser session serves both the analysis and an optional fill run
+    driver = None
     try:
         url = input("Enter the form URL: ")
         print("\nAnalyzing form fields...")
         
-        analyzer = FormAnalyzer(url)
+        driver = create_edge_driver(args.headless)
+        analyzer = FormAnalyzer(url, driver=driver)
         analyzer.analyze_form()
         
         if analyzer.form_fields:
@@ -231,12 +193,26 @@ def main() -> None:
             print("1. Open form_template.xlsx")
             print("2. Fill in the required information")
             print("3. Run form_filler.py to submit the form")
+            
+            if args.fill:
+                answer = input("\nFill in and save form_template.xlsx, then type 'y' to submit it in this browser: ")
+                if answer.strip().lower() == 'y':
+                    # load_excel_data refuses a template without data rows
+                    filler = FormFiller(url, 'form_template.xlsx', driver=driver)
+                    if filler.load_excel_data():
+                        filler.fill_form()
+                        print("\nForm filling process completed! Check form_automation.log for details.")
+                    else:
+                        print("\nError: The template has no data rows to submit. Fill it in and run form_filler.py.")
         else:
             print("\nNo form fields found. Please check the URL and try again.")
         
     except Exception as e:
         logging.error(f"Error in main: {e}")
         print("\nAn error occurred. Please check form_automation.log for details.")
+    finally:
+        if driver:
+            driver.quit()
 
 if __name__ == "__main__":
     main()
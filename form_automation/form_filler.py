@@ -1,22 +1,25 @@
 from selenium import webdriver
-from selenium.webdriver.edge.service import Service
-from selenium.webdriver.edge.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException, NoSuchElementException, ElementNotInteractableException
+from selenium.common.exceptions import (
+    TimeoutException, WebDriverException, NoSuchElementException, ElementNotInteractableException,
+    StaleElementReferenceException
+)
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
-from typing import List, Dict, Optional, Union, Any, cast, Tuple
-import pandas as pd
-import numpy as np
+from edge_driver import create_edge_driver
+from openpyxl import load_workbook
+from typing import List, Dict, Optional, Any, Tuple, Iterator
 import logging
+import logging.handlers
 import time
 import random
 import os
-import re
+import argparse
+import multiprocessing
+from itertools import chain, islice
+from functools import lru_cache
 
 # Setup logging
 logging.basicConfig(
@@ -28,31 +31,185 @@ logging.basicConfig(
     ]
 )
 
+# Matches row keys to fields and fills them in one round-trip; returns the keys it could not match
+_FILL_JS = """
+const values = arguments[0];
+const normalize = text => (text || '').toLowerCase().replace(/[^a-z0-9]/g, '');
+const similar = (a, b) => Boolean(a && b) && (a.includes(b) || b.includes(a));
+const labelText = el => {
+    const byFor = el.id && document.querySelector(`label[for="${CSS.escape(el.id)}"]`);
+    const parent = el.closest('label');
+    return [byFor ? byFor.innerText : '', parent ? parent.innerText : ''];
+};
+const fields = [...document.querySelectorAll("input:not([type='hidden']), textarea, select")]
+    .filter(el => !el.disabled && el.getClientRects().length > 0)
+    .map(el => ({
+        el,
+        names: [el.id, el.name].map(normalize).filter(Boolean),
+        texts: [...labelText(el), el.placeholder, el.getAttribute('aria-label')]
+            .map(normalize).filter(Boolean)
+    }));
+// Exact id/name matches win, then exact label text, and only then a fuzzy match;
+// a field is filled at most once, so two columns never land on the same input
+const used = new Set();
+const findField = key => {
+    const free = fields.filter(f => !used.has(f));
+    return free.find(f => f.names.includes(key))
+        || free.find(f => f.texts.includes(key))
+        || free.find(f => [...f.names, ...f.texts].some(k => similar(k, key)));
+};
+const findOption = (select, value) => {
+    const wanted = normalize(value);
+    if (!wanted) return undefined;
+    const options = [...select.options];
+    return options.find(o => normalize(o.text) === wanted || normalize(o.value) === wanted)
+        || options.find(o => similar(normalize(o.text), wanted));
+};
+const truthy = v => ['true', 'yes', '1', 'on'].includes(v.toLowerCase());
+const fire = el => {
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+};
+const unmatched = [];
+for (const [label, value] of Object.entries(values)) {
+    const key = normalize(label);
+    const match = key && findField(key);
+    if (!match) {
+        unmatched.push(label);
+        continue;
+    }
+    used.add(match);
+    const el = match.el;
+    // Password fields get real key events from safe_send_keys instead
+    if (el.type === 'password') {
+        unmatched.push(label);
+        continue;
+    }
+    if (el.type === 'checkbox') {
+        if (el.checked !== truthy(value)) el.click();
+    } else if (el.type === 'radio') {
+        if (truthy(value)) el.click();
+    } else if (el.tagName === 'SELECT') {
+        const option = findOption(el, value);
+        el.value = option ? option.value : value;
+        fire(el);
+    } else {
+        el.value = value;
+        fire(el);
+    }
+}
+return unmatched;
+"""
+
+# Returns [button, selector] for the first usable submit button, preferring the selector passed in
+_SUBMIT_JS = """
+const selectors = [
+    "button[type='submit'], input[type='submit']",
+    ".submit-button, .submitButton, .submit",
+    "input[type='image'][name*='submit']"
+];
+const usable = el => !el.disabled && el.getClientRects().length > 0;
+for (const selector of arguments[0] ? [arguments[0], ...selectors] : selectors) {
+    const button = [...document.querySelectorAll(selector)].find(usable);
+    if (button) return [button, selector];
+}
+const byText = [...document.querySelectorAll('button')].find(b => usable(b) && /submit/i.test(b.textContent));
+return byText ? [byText, null] : null;
+"""
+
+# Selects the option whose text is similar to the value, or sets the value directly if none is
+_SELECT_JS = """
+const select = arguments[0];
+const normalize = text => (text || '').toLowerCase().replace(/[^a-z0-9]/g, '');
+const wanted = normalize(arguments[1]);
+if (!select.options.length) return false;
+const options = [...select.options];
+// Exact text or value first; empty strings never match, so blank options are not picked
+const option = wanted ? (
+    options.find(o => normalize(o.text) === wanted || normalize(o.value) === wanted)
+    || options.find(o => {
+        const text = normalize(o.text);
+        return text && (text.includes(wanted) || wanted.includes(text));
+    })
+) : undefined;
+select.value = option ? option.value : arguments[1];
+select.dispatchEvent(new Event('change', {bubbles: true}));
+return Boolean(option);
+"""
+
+# Translation table deleting every ASCII character that is not a letter or digit
+_NON_ALNUM = str.maketrans('', '', ''.join(chr(c) for c in range(128) if not chr(c).isalnum()))
+
+@lru_cache(maxsize=4096)
+def _normalize(text: str) -> str:
+    """Lowercase and keep only ASCII letters and digits; labels repeat across rows"""
+    lowered = text.lower().translate(_NON_ALNUM)
+    return lowered if lowered.isascii() else ''.join(c for c in lowered if c.isascii())
+
+# Snapshot of every input with the attributes and nearby label text used for fuzzy matching
+_SNAPSHOT_JS = """
+const labelFor = el => {
+    const parent = el.closest('label');
+    if (parent) return parent.textContent;
+    const byFor = el.id && document.querySelector(`label[for="${CSS.escape(el.id)}"]`);
+    if (byFor) return byFor.textContent;
+    // A label placed right before the input, without for=
+    const sibling = el.previousElementSibling;
+    return sibling && sibling.tagName === 'LABEL' ? sibling.textContent : '';
+};
+return [...document.querySelectorAll("input:not([type='hidden']), textarea, select")].map(el => ({
+    element: el,
+    name: el.getAttribute('name') || '',
+    id: el.id || '',
+    placeholder: el.getAttribute('placeholder') || '',
+    ariaLabel: el.getAttribute('aria-label') || '',
+    type: el.type || '',
+    label: (labelFor(el) || '').trim()
+}));
+"""
+
 class FormFiller:
-    def __init__(self, url: str, excel_path: str):
-        """Initialize the form filler"""
+    # Fixed attribute set: faster attribute access on the per-row, per-field paths
+    __slots__ = (
+        'url', 'excel_path', 'human_like', 'row_delay', 'driver', 'wait', 'actions',
+        '_locator_cache', '_input_snapshot', '_submit_locator', '_submit_wait',
+        '_workbook', '_headers', '_rows_iter', '_owns_driver', 'success_selector', '_submit_confirms'
+    )
+
+    def __init__(self, url: str, excel_path: str, human_like: bool = False, row_delay: float = 0,
+                 driver: Optional[webdriver.Edge] = None, success_selector: Optional[str] = None):
+        """Initialize the form filler, optionally on a browser session owned by the caller"""
         self.url = url
         self.excel_path = excel_path
+        self.human_like = human_like
+        self.row_delay = row_delay
         self.driver: Optional[webdriver.Edge] = None
         self.wait: Optional[WebDriverWait] = None
-        self.data: Optional[pd.DataFrame] = None
         self.actions: Optional[ActionChains] = None
+        # Selectors and field types stay valid across reloads of the same form; element snapshots do not
+        self._locator_cache: Dict[str, Tuple[str, str, Optional[str]]] = {}
+        self._input_snapshot: Optional[List[Dict[str, Any]]] = None
+        # Submit button selector that worked last time, tried first on later rows
+        self._submit_locator: Optional[str] = None
+        self._submit_wait: Optional[WebDriverWait] = None
+        # CSS selector of an element shown after a successful submit, for forms that don't navigate
+        self.success_selector = success_selector
+        # Whether submits are confirmed by navigation or the success element; if not, use the short wait
+        self._submit_confirms: Optional[bool] = None
+        # Excel rows are streamed lazily instead of being loaded up front
+        self._workbook: Any = None
+        self._headers: List[Any] = []
+        self._rows_iter: Optional[Iterator[Tuple[Any, ...]]] = None
+        # A session passed in by the caller is reused and left open
+        self._owns_driver = driver is None
+        if driver:
+            self._bind_driver(driver)
         
-    def setup_driver(self) -> None:
+    def setup_driver(self, headless: bool = False) -> None:
         """Initialize Edge driver with custom options"""
         try:
-            edge_options = Options()
-            edge_options.add_argument('--start-maximized')
-            edge_options.add_argument('--disable-blink-features=AutomationControlled')
-            edge_options.add_argument('--disable-notifications')
-            edge_options.add_argument('--inprivate')
-            edge_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            edge_options.add_experimental_option('useAutomationExtension', False)
-            
-            service = Service(EdgeChromiumDriverManager().install())
-            self.driver = webdriver.Edge(service=service, options=edge_options)
-            self.wait = WebDriverWait(self.driver, 10)
-            self.actions = ActionChains(self.driver)
+            self.driver = create_edge_driver(headless)
+            self._bind_driver(self.driver)
             logging.info("Browser setup completed successfully")
             
         except Exception as e:
@@ -62,9 +219,32 @@ class FormFiller:
             self.driver = None
             raise
 
+    def _bind_driver(self, driver: webdriver.Edge) -> None:
+        """Create the waits and action chains used with a browser session"""
+        self.driver = driver
+        self.wait = WebDriverWait(driver, 10)
+        # Short wait for a submit button before falling back to form.submit()
+        self._submit_wait = WebDriverWait(driver, 2)
+        self.actions = ActionChains(driver)
+
+    def open_form(self) -> None:
+        """Load the form and drop element snapshots from the previous page"""
+        if not self.driver:
+            return
+        self.driver.get(self.url)
+        self._input_snapshot = None
+        self._wait_ready()
+
+    def _wait_ready(self) -> None:
+        """Wait until the form has a fillable field; the eager page load returns before scripts add them"""
+        if self.wait:
+            self.wait.until(lambda d: d.execute_script(
+                "return !!document.querySelector(\"input:not([type='hidden']), textarea, select\")"
+            ))
+
     def normalize_string(self, text: str) -> str:
         """Normalize string for comparison"""
-        return re.sub(r'[^a-zA-Z0-9]', '', text.lower())
+        return _normalize(text)
 
     def strings_similar(self, str1: str, str2: str) -> bool:
         """Check if two strings are similar"""
@@ -74,14 +254,27 @@ class FormFiller:
 
     def find_field_by_multiple_strategies(self, label: str) -> Optional[WebElement]:
         """Find form field using multiple strategies"""
-        if not self.driver or not self.wait:
-            return None
+        return self._find_field(label)[0]
 
-        # Only create strategies if driver exists
-        driver = self.driver  # Local reference to avoid multiple checks
+    def _find_field(self, label: str) -> Tuple[Optional[WebElement], Optional[str]]:
+        """Find a form field and its type, caching both per label"""
+        driver = self.driver  # Local reference
         if not driver:
-            return None
+            return None, None
+
+        # Try the strategy that matched this label before
+        cached = self._locator_cache.get(label)
+        if cached:
+            by, selector, field_type = cached
+            try:
+                field = driver.find_element(by, selector)
+                if field and field.is_displayed() and field.is_enabled():
+                    return field, field_type
+            except (NoSuchElementException, ElementNotInteractableException, StaleElementReferenceException):
+                pass
+            del self._locator_cache[label]
 
+        # Only build the strategies once the cache has missed
         strategies = [
             # By label with 'for' attribute
             (By.CSS_SELECTOR, f"label[for*='{label}'] + input, label[for*='{label}'] + select, label[for*='{label}'] + textarea"),
@@ -113,84 +306,121 @@ class FormFiller:
             try:
                 field = driver.find_element(by, selector)
                 if field and field.is_displayed() and field.is_enabled():
-                    return field
+                    field_type = field.get_attribute('type')
+                    self._locator_cache[label] = (by, selector, field_type)
+                    return field, field_type
             except (NoSuchElementException, ElementNotInteractableException):
                 continue
 
         # If no exact match found, try fuzzy matching on all input fields
         try:
-            all_inputs = driver.find_elements(By.CSS_SELECTOR, "input:not([type='hidden']), textarea, select")
-            for input_field in all_inputs:
-                # Check various attributes for similarity
-                for attr in ['name', 'id', 'placeholder', 'aria-label']:
-                    attr_value = input_field.get_attribute(attr)
+            for snapshot in self._get_input_snapshot():
+                input_field = snapshot['element']
+                # Check various attributes and the nearby label for similarity
+                for attr in ['name', 'id', 'placeholder', 'ariaLabel', 'label']:
+                    attr_value = snapshot[attr]
                     if attr_value and self.strings_similar(label, attr_value):
-                        return input_field
-                
-                # Check nearby labels
-                try:
-                    nearby_labels = driver.find_elements(By.XPATH, f"//label[ancestor::*[count(.|//{input_field.tag_name}[@id='{input_field.get_attribute('id')}'])=count(//{input_field.tag_name}[@id='{input_field.get_attribute('id')}'])]]")
-                    for nearby_label in nearby_labels:
-                        if self.strings_similar(label, nearby_label.text):
-                            return input_field
-                except:
-                    continue
+                        field_type = snapshot['type']
+                        if snapshot['id']:
+                            self._locator_cache[label] = (By.ID, snapshot['id'], field_type)
+                        elif snapshot['name']:
+                            self._locator_cache[label] = (By.NAME, snapshot['name'], field_type)
+                        return input_field, field_type
                     
         except Exception as e:
             logging.warning(f"Error in fuzzy matching: {e}")
 
-        return None
+        return None, None
 
-    def load_excel_data(self) -> bool:
-        """Load data from Excel template"""
+    def _get_input_snapshot(self) -> List[Dict[str, Any]]:
+        """Return the input snapshot for the current page, taking it on first use"""
+        if self._input_snapshot is None and self.driver:
+            self._input_snapshot = self.driver.execute_script(_SNAPSHOT_JS) or []
+        return self._input_snapshot or []
+
+    def load_excel_data(self, worker: int = 0, workers: int = 1) -> bool:
+        """Open the Excel template for streaming, keeping every workers-th row from worker"""
         try:
-            self.data = pd.read_excel(self.excel_path)
-            if self.data is None:
-                logging.error("Excel file could not be loaded")
-                return False
-                
-            if isinstance(self.data, pd.DataFrame) and self.data.empty:
+            self.close_excel_data()
+            self._workbook = load_workbook(self.excel_path, read_only=True, data_only=True)
+            rows = self._workbook.active.iter_rows(values_only=True)
+            
+            headers = next(rows, None)
+            if not headers or all(header is None for header in headers):
                 logging.error("Excel file is empty")
+                self.close_excel_data()
                 return False
-                
-            row_count = len(self.data) if isinstance(self.data, pd.DataFrame) else 0
-            if row_count == 0:
-                logging.error("No data rows found in Excel file")
+            self._headers = list(headers)
+            
+            # Skip blank rows, then take this worker's share
+            data_rows = (row for row in rows if any(value is not None for value in row))
+            data_rows = islice(data_rows, worker, None, workers)
+            first_row = next(data_rows, None)
+            if first_row is None:
+                if worker:
+                    # More workers than rows: this share is simply empty
+                    logging.info(f"No rows left for worker {worker + 1} of {workers}")
+                else:
+                    logging.error("No data rows found in Excel file")
+                self.close_excel_data()
                 return False
                 
-            logging.info(f"Loaded {row_count} rows of data from Excel")
+            self._rows_iter = chain([first_row], data_rows)
+            logging.info(f"Streaming rows of data from Excel with {len(self._headers)} columns")
             return True
             
         except Exception as e:
             logging.error(f"Error loading Excel data: {e}")
+            self.close_excel_data()
             return False
 
-    def safe_send_keys(self, field: WebElement, value: str) -> None:
+    def estimated_row_count(self) -> Optional[int]:
+        """Data rows according to the sheet's recorded dimensions, which may include blank rows"""
+        if self._workbook is None:
+            return None
+        max_row = self._workbook.active.max_row
+        return max(max_row - 1, 0) if max_row else None
+
+    def close_excel_data(self) -> None:
+        """Release the streamed workbook"""
+        if self._workbook is not None:
+            self._workbook.close()
+        self._workbook = None
+        self._rows_iter = None
+
+    def safe_send_keys(self, field: WebElement, value: str, field_type: Optional[str] = None) -> None:
         """Safely send keys to a field with multiple attempts"""
+        if field_type is None:
+            field_type = field.get_attribute('type')
+        # Password fields skip the JS shortcut so the page sees real key events
+        sensitive = field_type == 'password'
         max_attempts = 3
         for attempt in range(max_attempts):
             try:
-                # Try clicking the field first
-                field.click()
-                time.sleep(random.uniform(0.1, 0.3))
-                
-                # Clear the field
-                field.clear()
-                time.sleep(random.uniform(0.1, 0.3))
-                
                 # Try different input methods
-                if attempt == 0:
-                    # Normal typing
-                    for char in value:
-                        field.send_keys(char)
-                        time.sleep(random.uniform(0.05, 0.15))
-                elif attempt == 1:
+                if attempt == 0 and not sensitive:
                     # JavaScript injection
                     if self.driver:
-                        self.driver.execute_script("arguments[0].value = arguments[1]", field, value)
+                        self.driver.execute_script(
+                            "arguments[0].value = arguments[1];"
+                            "arguments[0].dispatchEvent(new Event('input', {bubbles: true}));"
+                            "arguments[0].dispatchEvent(new Event('change', {bubbles: true}));",
+                            field, value
+                        )
+                elif attempt <= 1:
+                    field.click()
+                    field.clear()
+                    if self.human_like:
+                        # Optional human-like typing
+                        for char in value:
+                            field.send_keys(char)
+                            time.sleep(random.uniform(0.05, 0.15))
+                    else:
+                        field.send_keys(value)
                 else:
                     # Action chains
                     if self.actions:
+                        field.clear()
                         self.actions.move_to_element(field).click().send_keys(value).perform()
                 
                 # Verify the input
@@ -200,35 +430,21 @@ class FormFiller:
                     
             except Exception as e:
                 logging.warning(f"Attempt {attempt + 1} failed: {e}")
-                time.sleep(0.5)
                 
         raise ValueError(f"Failed to input value after {max_attempts} attempts")
 
-    def fill_field(self, field: WebElement, value: Any, field_name: str) -> None:
-        """Fill a form field with value using human-like interaction"""
+    def fill_field(self, field: WebElement, value: Any, field_name: str,
+                   field_type: Optional[str] = None) -> None:
+        """Fill a form field with a non-empty value; callers skip empty cells"""
         try:
-            # Convert value to string, handling None and nan
-            str_value = str(value) if pd.notna(value) and value is not None else ""
-            if not str_value:
-                return
-                
-            field_type = field.get_attribute('type')
+            str_value = str(value)
+            if field_type is None:
+                field_type = field.get_attribute('type')
             
             if field_type == 'select-one':
-                # Handle dropdown
-                select_handled = False
-                options = field.find_elements(By.TAG_NAME, 'option')
-                
-                for option in options:
-                    if self.strings_similar(option.text, str_value):
-                        option.click()
-                        select_handled = True
-                        break
-                        
-                if not select_handled and options:
-                    # If no match found but options exist, try to set value directly
-                    if self.driver:
-                        self.driver.execute_script("arguments[0].value = arguments[1]", field, str_value)
+                # Handle dropdown, matching the option text inside the page
+                if self.driver:
+                    self.driver.execute_script(_SELECT_JS, field, str_value)
                         
             elif field_type == 'checkbox':
                 # Handle checkbox
@@ -244,110 +460,171 @@ class FormFiller:
                     
             else:
                 # Handle text input fields
-                self.safe_send_keys(field, str_value)
+                self.safe_send_keys(field, str_value, field_type)
                 
             logging.info(f"Filled field '{field_name}' with value: {str_value}")
             
         except Exception as e:
             logging.error(f"Error filling field '{field_name}': {e}")
 
+    def _js_fill(self, row_dict: Dict[str, str]) -> List[str]:
+        """Fill all row values in the page in one script, returning unmatched labels"""
+        # Human-like typing needs per-key events, so every field goes through safe_send_keys
+        if not self.driver or self.human_like:
+            return list(row_dict)
+            
+        try:
+            unmatched = self.driver.execute_script(_FILL_JS, row_dict) or []
+        except WebDriverException as e:
+            logging.warning(f"Batch fill failed, falling back to per-field fill: {e}")
+            return list(row_dict)
+            
+        for field_name, value in row_dict.items():
+            if field_name not in unmatched:
+                logging.info(f"Filled field '{field_name}' with value: {value}")
+        return unmatched
+
     def submit_form(self) -> bool:
         """Submit the form with multiple strategies"""
-        if not self.driver or not self.wait or not self.actions:
+        if not self.driver or not self.wait or not self._submit_wait:
             return False
 
         driver = self.driver  # Local reference
-        actions = self.actions  # Local reference
         wait = self.wait  # Local reference
 
-        submit_strategies = [
-            # Standard submit buttons
-            (By.CSS_SELECTOR, "button[type='submit'], input[type='submit']"),
-            # Common submit button classes
-            (By.CSS_SELECTOR, ".submit-button, .submitButton, .submit"),
-            # Buttons containing 'submit' text
-            (By.XPATH, "//button[contains(translate(text(), 'SUBMIT', 'submit'), 'submit')]"),
-            # Submit images
-            (By.CSS_SELECTOR, "input[type='image'][name*='submit']"),
-            # Form submit via JavaScript
-            (None, None)  # Special case for JavaScript submit
-        ]
-
-        for by, selector in submit_strategies:
+        try:
+            # Remember the current page so the submission can be detected
+            start_url = driver.current_url
+            page = driver.find_element(By.TAG_NAME, 'html')
+            
+            # Find the first usable submit button in one script, polling briefly for late renders
             try:
-                if by and selector:
-                    submit_button = wait.until(EC.element_to_be_clickable((by, selector)))
-                    actions.move_to_element(submit_button).click().perform()
-                else:
-                    # Try JavaScript form submit
-                    driver.execute_script("document.forms[0].submit()")
-                        
-                time.sleep(random.uniform(2.0, 3.0))
-                return True
+                submit_button, selector = self._submit_wait.until(
+                    lambda d: d.execute_script(_SUBMIT_JS, self._submit_locator) or False
+                )
+            except TimeoutException:
+                submit_button, selector = None, None
                 
-            except Exception as e:
-                logging.warning(f"Submit strategy failed: {e}")
-                continue
-
-        return False
+            if submit_button:
+                driver.execute_script("arguments[0].click()", submit_button)
+                self._submit_locator = selector
+            else:
+                # Try JavaScript form submit
+                driver.execute_script("document.forms[0].submit()")
+                
+        except Exception as e:
+            logging.warning(f"Submit failed: {e}")
+            return False
+            
+        # Wait for the URL to change, the page to be replaced or the success element to show
+        conditions = [EC.url_changes(start_url), EC.staleness_of(page)]
+        if self.success_selector:
+            conditions.append(EC.visibility_of_element_located((By.CSS_SELECTOR, self.success_selector)))
+        submitted_wait = self._submit_wait if self._submit_confirms is False else wait
+        try:
+            submitted_wait.until(EC.any_of(*conditions))
+            self._submit_confirms = True
+        except TimeoutException:
+            # Later rows of a form that stays put only wait the short timeout
+            if self._submit_confirms is None:
+                logging.warning("Page did not change after submit; using the short wait from now on")
+            self._submit_confirms = False
+        return True
 
     def fill_form(self) -> None:
         """Fill form with data from Excel"""
-        if not self.driver or not self.wait or self.data is None:
+        if not self.driver or not self.wait or self._rows_iter is None:
             return
             
         try:
             # Navigate to form URL
-            self.driver.get(self.url)
-            time.sleep(2)  # Wait for page load
+            self.open_form()
+            reload_form = False
+            
+            # Clean the column labels once; remove asterisk from required field labels
+            field_names = [None if header is None else str(header).replace(' *', '')
+                           for header in self._headers]
             
-            # Process each row in the Excel file
-            df = cast(pd.DataFrame, self.data)
-            total_rows = len(df)
+            # Bind the per-row methods once outside the loop
+            open_form = self.open_form
+            js_fill = self._js_fill
+            find_field = self._find_field
+            fill_field = self.fill_field
+            submit_form = self.submit_form
+            row_delay = self.row_delay
             
-            for idx in range(total_rows):
-                row = df.iloc[idx]
+            # Process each row in the Excel file as it is read
+            for idx, row in enumerate(self._rows_iter):
+                # Navigate back to the form after the previous submission
+                if reload_form:
+                    open_form()
+                    reload_form = False
                 logging.info(f"Processing form submission {idx + 1}")
                 
-                # Fill each field
-                for field_name in df.columns:
-                    value = row[field_name]
-                    if pd.isna(value):
-                        continue
-                        
-                    # Remove asterisk from required field labels
-                    if isinstance(field_name, str):
-                        clean_field_name = field_name.replace(' *', '')
-                    else:
-                        clean_field_name = str(field_name)
-                    
-                    # Find and fill the field
-                    field = self.find_field_by_multiple_strategies(clean_field_name)
+                # Collect the row's values keyed by field label
+                row_dict: Dict[str, str] = {
+                    field_name: str(value)
+                    for field_name, value in zip(field_names, row)
+                    if field_name is not None and value is not None and value != ''
+                }
+                
+                # Fill everything in one script, then fall back per field for the rest
+                for clean_field_name in js_fill(row_dict):
+                    field, field_type = find_field(clean_field_name)
                     if field:
-                        self.fill_field(field, value, clean_field_name)
-                        time.sleep(random.uniform(0.3, 0.7))
+                        fill_field(field, row_dict[clean_field_name], clean_field_name, field_type)
                     else:
                         logging.warning(f"Could not find field: {clean_field_name}")
                 
                 # Submit the form
-                if self.submit_form():
+                if submit_form():
                     logging.info(f"Submitted form {idx + 1}")
-                    
-                    # If there are more forms to fill, navigate back to the form
-                    if idx < total_rows - 1:
-                        self.driver.get(self.url)
-                        time.sleep(2)
+                    reload_form = True
                 else:
                     logging.error(f"Failed to submit form {idx + 1}")
                 
+                # Optional pacing between submissions
+                if row_delay:
+                    time.sleep(row_delay)
+                
         except Exception as e:
             logging.error(f"Error in form filling process: {e}")
         finally:
-            if self.driver:
+            self.close_excel_data()
+            if self.driver and self._owns_driver:
                 self.driver.quit()
 
+def _init_worker_logging(log_queue: Any) -> None:
+    """Send this worker's log records to the parent process instead of the shared log file"""
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+def _fill_rows(url: str, excel_path: str, worker: int, workers: int,
+               success_selector: Optional[str] = None, headless: bool = False) -> None:
+    """Fill every workers-th row, starting at worker, with its own browser"""
+    filler = FormFiller(url, excel_path, success_selector=success_selector)
+    try:
+        if not filler.load_excel_data(worker, workers):
+            return
+        filler.setup_driver(headless)
+        filler.fill_form()
+    except Exception as e:
+        logging.error(f"Error in worker filling rows: {e}")
+
 def main() -> None:
     """Main function to run the form filler"""
+    parser = argparse.ArgumentParser(description="Fill a web form once per Excel row")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="number of browser sessions submitting rows in parallel")
+    parser.add_argument('--success-selector',
+                        help="CSS selector of an element shown after a successful submit")
+    parser.add_argument('--headless', action='store_true',
+                        help="run Edge without a window, e.g. on CI")
+    args = parser.parse_args()
+    
     try:
         url = input("Enter the form URL: ")
         excel_path = input("Enter the path to Excel template: ")
@@ -357,11 +634,32 @@ def main() -> None:
             return
             
         print("\nStarting form filling process...")
-        filler = FormFiller(url, excel_path)
+        filler = FormFiller(url, excel_path, success_selector=args.success_selector)
         
         if filler.load_excel_data():
-            filler.setup_driver()
-            filler.fill_form()
+            workers = max(1, args.workers)
+            estimated_rows = filler.estimated_row_count()
+            if estimated_rows:
+                workers = min(workers, estimated_rows)
+            if workers == 1:
+                filler.setup_driver(args.headless)
+                filler.fill_form()
+            else:
+                # Submissions are independent, so each session streams its own share of rows
+                filler.close_excel_data()
+                # Only this process writes the log; workers forward their records through a queue
+                log_queue = multiprocessing.Queue()
+                listener = logging.handlers.QueueListener(log_queue, *logging.getLogger().handlers,
+                                                          respect_handler_level=True)
+                listener.start()
+                try:
+                    with multiprocessing.Pool(processes=workers, initializer=_init_worker_logging,
+                                              initargs=(log_queue,)) as pool:
+                        pool.starmap(_fill_rows, [(url, excel_path, worker, workers,
+                                                   args.success_selector, args.headless)
+                                                  for worker in range(workers)])
+                finally:
+                    listener.stop()
             print("\nForm filling process completed! Check form_automation.log for details.")
         else:
             print("\nError: Could not load Excel data. Please check the file and try again.")